@@ -591,10 +591,7 @@ def _construct_table_properties_ddl(skip_headers, storage_format_selector, encry
 
 
 def _get_data_frame_column_types(data_frame):
-    data_frame_col_dict = {}
-    for col in data_frame:
-        data_frame_col_dict[col] = type(data_frame[col][0]).__name__
-    return data_frame_col_dict
+    return {col: type(data_frame[col][0]).__name__ for col in data_frame}
 
 
 def get_athena_columns_from_dataframe(data_frame: DataFrame) -> List[dict]:
@@ -604,8 +601,6 @@ def get_athena_columns_from_dataframe(data_frame: DataFrame) -> List[dict]:
         data_frame (DataFrame): the dataframe which the columns need to be extracted
     Returns: list of dict
     """
-    column_dtype = _get_data_frame_column_types(data_frame)
     return [
         {"column": field_name, "type": _PYTHON_TO_ATHENA_DATA_TYPE_MAP.get(field_type, "STRING")}
-        for
-        field_name, field_type in column_dtype.items()]
+        for field_name, field_type in _get_data_frame_column_types(data_frame).items()]
@@ -7,7 +7,7 @@ import uuid
 from multiprocessing.pool import Pool
 from pathlib import Path
 from tempfile import NamedTemporaryFile
-from typing import List, Any
+from typing import List, Any, Iterator
 
 import arrow
 import pandas as pd
@@ -172,16 +172,24 @@ class S3Util(AwsUtil):
             key_prefix (str): Key Prefix under which all objects are to be listed
         Returns: list[str]
         """
+        return list(self.iter_keys(key_prefix))
+
+    def iter_keys(self, key_prefix: str) -> Iterator[str]:
+        """
+        Lazily yields all objects under a given key prefix, one listing page at a time, so that
+        consumers can start working on keys before the listing is complete
+        Args:
+            key_prefix (str): Key Prefix under which all objects are to be listed
+        Returns: Iterator[str]
+        """
         continuation_token = None
-        keys = []
         while True:
             result = self._list_object_page(key_prefix, continuation_token)
-
-            keys = keys + [content.get('Key', None) for content in result.get('Contents', [])]
+            for content in result.get('Contents', []):
+                yield content.get('Key', None)
             if 'NextContinuationToken' not in result:
                 break
             continuation_token = result['NextContinuationToken']
-        return keys
 
     def _list_object_page(self, key_prefix: str, continuation_token: str):
         if continuation_token is None:
@@ -8,10 +8,10 @@ import re
 import uuid
 from abc import ABC, abstractmethod
 from collections import OrderedDict
+from functools import lru_cache
 from typing import List
 
 import pandas as pd
-import stringcase
 from pandas import DataFrame
 
 COMMON_INTEGER_FIELDS = ["id", "campaign_id", "base_ad_group_id", "country__territory",
@@ -173,16 +173,23 @@ def flatten_nested_dict(data: dict, delimiter: str = "_", snake_cased_keys: bool
     Returns: dict
     """
 
-    def expand(key, value):
-        if isinstance(value, (dict, OrderedDict)):
-            return [(key + delimiter + k, v) for k, v in flatten_nested_dict(value).items()]
+    flattened = {}
+    # Depth first walk keeping the iterators of the dictionaries being expanded, so that the keys
+    # are written in the same order, and later duplicate keys win, as with a recursive expansion
+    stack = [(None, iter(data.items()))]
+    while stack:
+        prefix, items = stack[-1]
+        for key, value in items:
+            # Nested keys are always snake cased and joined with an underscore below the top level
+            key = key if prefix is None else f"{prefix}{to_snake_case(key)}"
+            if isinstance(value, (dict, OrderedDict)):
+                separator = delimiter if prefix is None else "_"
+                stack.append((f"{key}{separator}", iter(value.items())))
+                break
+            flattened[to_snake_case(key) if snake_cased_keys else key] = value
         else:
-            return [(key, value)]
-
-    items = [item for k, v in data.items() for item in expand(k, v)]
-    if snake_cased_keys:
-        items = [(to_snake_case(k), v) for k, v in items]
-    return dict(items)
+            stack.pop()
+    return flattened
 
 
 camel_case_detect = re.compile(r'(?<!^)(?=[A-Z])')
@@ -192,41 +199,68 @@ special_characters_detect = re.compile(r'[^a-zA-Z0-9]')
 """Regex pattern to detect special characters"""
 
 
+class _SpecialCharacterTable(dict):
+    """
+    str.translate table replacing anything but ascii letters and digits with an underscore, the
+    same characters as special_characters_detect, filled in as characters are first seen
+    """
+
+    def __missing__(self, code_point):
+        character = chr(code_point)
+        replacement = character if character.isascii() and character.isalnum() else '_'
+        self[code_point] = replacement
+        return replacement
+
+
+_SPECIAL_CHARACTERS_TO_UNDERSCORE = _SpecialCharacterTable()
+
+
+@lru_cache(maxsize=4096)
 def to_snake_case(column_name: str) -> str:
     """
-    Converts the column name to Athena compatible snake_case
+    Converts the column name to Athena compatible snake_case, results are cached as the same keys
+    and column names repeat across records
 
     Args:
         column_name (str): column name string to be sanitized
     Returns: str
     """
-    # Detect and replace special_chars
-    str_replaced_special_chars = special_characters_detect.sub('_', column_name)
-    return stringcase.snakecase(str_replaced_special_chars)
+    # Detect and replace special_chars, plain ascii alphanumeric names have none to replace
+    str_replaced_special_chars = column_name
+    if not (column_name.isascii() and column_name.isalnum()):
+        str_replaced_special_chars = column_name.translate(_SPECIAL_CHARACTERS_TO_UNDERSCORE)
+    # Only ascii letters, digits and underscores are left, so prefixing every upper case letter
+    # after the first character with an underscore and lower casing matches stringcase.snakecase
+    return camel_case_detect.sub('_', str_replaced_special_chars).lower()
 
 
 def nested_list_of_dict_to_dataframe(data: List[dict]) -> DataFrame:
-    flattened_dicts = [flatten_nested_dict(d) for d in data]
-    for dic in flattened_dicts:
-        _convert_object_value_to_string(dic)
-    df = DataFrame(data=flattened_dicts)
+    df = DataFrame(data=[flatten_nested_dict(d) for d in data])
+    # Lists can only end up in object columns, so the other columns are never looked at
+    for column in df.select_dtypes(include=object).columns:
+        df[column] = pd.Series([_convert_list_items_to_string(value) for value in df[column].values],
+                               index=df.index,
+                               dtype=object)
     validate_and_fix_common_integer_fields(df)
     return df
 
 
-def _convert_object_value_to_string(dic):
-    for key, value in dic.items():
-        if isinstance(value, list) and any(isinstance(x, object) for x in value) and value:
-            dic[key] = [json.dumps(obj, default=lambda x: getattr(x, '__dict__', str(x))) for obj in
-                        value]
+def _convert_list_items_to_string(value):
+    if isinstance(value, list) and value:
+        return [json.dumps(obj, default=_json_default) for obj in value]
+    return value
+
+
+def _json_default(obj):
+    return getattr(obj, '__dict__', str(obj))
 
 
 def validate_and_fix_common_integer_fields(df: DataFrame):
     for common_int_field in COMMON_INTEGER_FIELDS:
         if common_int_field in df.columns:
-            df[common_int_field] = pd.to_numeric(df[common_int_field], errors='coerce')
-            df[common_int_field].fillna(0, inplace=True)
-            df[common_int_field] = df[common_int_field].astype(int)
+            df[common_int_field] = pd.to_numeric(df[common_int_field], errors='coerce') \
+                .fillna(0) \
+                .astype('int64')
 
 
 def dataframe_columns_to_snake_case(data: DataFrame) -> None:
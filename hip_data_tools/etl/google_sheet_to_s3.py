@@ -51,12 +51,16 @@ class GoogleSheetToS3:
     def __init__(self, settings: GoogleSheetsToS3Settings):
         self.__settings = settings
         self.data = None
+        self._sheets_util = None
 
     def _get_sheets_util(self):
-        return SheetUtil(
-            conn_manager=GoogleSheetConnectionManager(self.__settings.source_connection_settings),
-            workbook_url=self.__settings.source_workbook_url,
-            sheet=self.__settings.source_sheet)
+        if self._sheets_util is None:
+            self._sheets_util = SheetUtil(
+                conn_manager=GoogleSheetConnectionManager(
+                    self.__settings.source_connection_settings),
+                workbook_url=self.__settings.source_workbook_url,
+                sheet=self.__settings.source_sheet)
+        return self._sheets_util
 
     def _get_s3_util(self):
         return S3Util(
@@ -4,8 +4,9 @@ S3 related ETL components Extractors, Loaders, Transformers, etc.
 """
 
 from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from dataclasses import dataclass
-from typing import Optional, List, Tuple, Any, NewType
+from typing import Optional, List, Tuple, Any, NewType, Iterator, Iterable
 
 from pandas import DataFrame
 
@@ -88,6 +89,32 @@ class S3FilesExtractor(S3Extractor):
             self._file_counter = len(self._source_keys)
         return self._source_keys
 
+    def iter_source_files(self) -> Iterator[S3Key]:
+        """
+        Lazily yields the files that match the source settings page by page, without caching
+        them or affecting the state of the extractor
+
+        Returns: Iterator[S3Key]
+
+        """
+        for key in self._get_s3_util().iter_keys(self._settings.key_prefix):
+            if not self._settings.suffix or key.endswith(self._settings.suffix):
+                yield key
+
+    def iter_remaining_source_files(self) -> Iterator[S3Key]:
+        """
+        Yields the files that have not been extracted yet. These are the rest of the cached
+        listing when there is one, otherwise the files are listed lazily page by page
+
+        Returns: Iterator[S3Key]
+
+        """
+        if self._source_keys is None:
+            yield from self.iter_source_files()
+        else:
+            # extract_next walks the cached listing from the end
+            yield from reversed(self._source_keys[:self._file_counter])
+
     def _next_file_path(self) -> str:
         file = self.list_source_files()[self._file_counter - 1]
         self._file_counter -= 1
@@ -104,6 +131,17 @@ class S3FilesExtractor(S3Extractor):
     def reset(self) -> None:
         self._source_keys = None
 
+    def mark_exhausted(self) -> None:
+        """
+        Mark every source file as extracted, for when the files were consumed through
+        iter_source_files instead of extract_next
+
+        Returns: None
+
+        """
+        self._source_keys = []
+        self._file_counter = 0
+
 
 class S3FileLocationExtractor(S3FilesExtractor):
     """
@@ -207,6 +245,32 @@ class S3FileCopyLoader(S3Loader):
                  target_key)
         s3.copy(copy_source, self._settings.bucket, target_key)
 
+    def load_all(self, data: Iterable[Tuple[S3Bucket, S3Key, S3Key]], max_workers: int) -> None:
+        """
+        Transfer many source s3 keys to target concurrently, consuming the data lazily with at
+        most twice max_workers copies submitted at any time
+        Args:
+            data (Iterable[Tuple[S3Bucket, S3Key, S3Key]]): source s3 bucket, source key and target
+                key tuples
+            max_workers (int): number of concurrent copies
+        Returns: None
+        """
+        # boto3 clients are thread safe but their creation is not, so create it up front
+        self._get_s3_util().get_client()
+        # executor.map submits the whole iterable up front, keep a sliding window of futures
+        # instead so that the data is only pulled as copies complete
+        max_pending = 2 * max_workers
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = set()
+            for item in data:
+                if len(pending) >= max_pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        future.result()
+                pending.add(executor.submit(self.load, item))
+            for future in pending:
+                future.result()
+
 
 class S3DataFrameAsParquetFileLoader(S3Loader):
     """
@@ -1,11 +1,11 @@
 """
 Module to deal with data transfer from S3 to Cassandra
 """
-from typing import List, Optional
+from typing import List, Optional, Iterator, Tuple
 
 from hip_data_tools.etl.common import ETL
 from hip_data_tools.etl.s3 import S3SourceSettings, S3SinkSettings, S3FileLocationExtractor, \
-    S3FileCopyLoader, S3Key, S3FileNameTransformer, AddTargetS3KeyTransformer
+    S3FileCopyLoader, S3Key, S3FileNameTransformer, AddTargetS3KeyTransformer, S3Bucket
 
 
 class S3ToS3FileCopy(ETL):
@@ -37,10 +37,14 @@ class S3ToS3FileCopy(ETL):
         source (S3SourceSettings): Settings for source s3 files
         sink (S3SinkSettings): Settings for target s3 directory
         transformers (List[S3FileNameTransformer]): Transformers to change file names
+        max_workers (int): Number of concurrent copies used by execute_all
     """
 
     def __init__(self, source: S3SourceSettings, sink: S3SinkSettings,
-                 transformers: Optional[List[S3FileNameTransformer]] = None):
+                 transformers: Optional[List[S3FileNameTransformer]] = None,
+                 max_workers: int = 10):
+        self._source = source
+        self.max_workers = max_workers
         default_transformer = AddTargetS3KeyTransformer(target_key_prefix=None)
         if not transformers:
             transformers = [default_transformer]
@@ -58,3 +62,23 @@ class S3ToS3FileCopy(ETL):
 
         """
         return self.extractor.list_source_files()
+
+    def _iter_work(self) -> Iterator[Tuple[S3Bucket, S3Key, S3Key]]:
+        for source_key in self.extractor.iter_remaining_source_files():
+            transformed_data = (self._source.bucket, source_key)
+            for transformer in self.transformers:
+                transformed_data = transformer.transform(transformed_data)
+            yield transformed_data
+
+    def execute_all(self) -> None:
+        """
+        Copy all source files not yet copied to the sink, copies run concurrently on max_workers
+        threads and, when the files have not been listed yet, start while the source listing is
+        still being paged through. The extractor is marked as exhausted afterwards so that
+        has_next is False
+
+        Returns: None
+
+        """
+        self.loader.load_all(self._iter_work(), max_workers=self.max_workers)
+        self.extractor.mark_exhausted()
@@ -2,8 +2,10 @@
 Module contains variables and methods used for common / shared operations throughput the google
 services package
 """
+import hashlib
+import json
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Sequence
 
 from dataclasses import dataclass
 from oauth2client.service_account import ServiceAccountCredentials
@@ -39,10 +41,19 @@ class GoogleApiConnectionManager(ABC):
     Google API connection manager abstract class
     """
 
-    def __init__(self, settings: GoogleApiConnectionSettings, scope: List[str]):
+    def __init__(self, settings: GoogleApiConnectionSettings, scope: Sequence[str]):
         self.settings = settings
         self.scope = scope
 
+    def _credentials_cache_key(self) -> str:
+        """
+        A digest of the service account key and scope, identical for managers that would
+        authenticate as the same identity
+        Returns (str): hex digest
+        """
+        key_json = json.dumps(self.settings.secrets_manager.key_json, sort_keys=True)
+        return hashlib.sha256(f"{key_json}|{' '.join(self.scope)}".encode()).hexdigest()
+
     def _credentials(self):
         """
         Get the credentials for google sheets
@@ -2,7 +2,7 @@
 This module is responsible for all Google sheets operations
 """
 import re
-from typing import List, Any
+from typing import List, Any, Dict, Tuple
 
 import pandas as pd
 from pandas import DataFrame
@@ -11,31 +11,58 @@ import gspread
 from hip_data_tools.common import LOG
 from hip_data_tools.google.common import GoogleApiConnectionManager, GoogleApiConnectionSettings
 
+DEFAULT_SHEETS_SCOPES: Tuple[str, ...] = ('https://spreadsheets.google.com/feeds',
+                                         'https://www.googleapis.com/auth/drive')
+
 
 class GoogleSheetConnectionManager(GoogleApiConnectionManager):
-    """Encapsulates the Google sheets API connection settings"""
+    """
+    Encapsulates the Google sheets API connection settings, the authorised client is shared by all
+    managers using the same service account so that they reuse its pooled HTTPS connections
+    """
+    _shared_clients: Dict[str, gspread.Client] = {}
 
     def __init__(self, settings: GoogleApiConnectionSettings):
-        super().__init__(settings, scope=['https://spreadsheets.google.com/feeds',
-                                          'https://www.googleapis.com/auth/drive'])
+        super().__init__(settings, scope=DEFAULT_SHEETS_SCOPES)
 
     def get_client(self):
         """
         Get the connection for google sheets
         Returns: authorised connection for google sheets
         """
-        return gspread.authorize(self._credentials())
+        cache_key = self._credentials_cache_key()
+        client = GoogleSheetConnectionManager._shared_clients.get(cache_key)
+        if client is None:
+            client = gspread.authorize(self._credentials())
+            GoogleSheetConnectionManager._shared_clients[cache_key] = client
+        return client
+
+
+def _rows_to_a1_range(first_row_number: int, last_row_number: int) -> str:
+    return f"A{first_row_number}:{last_row_number}"
+
+
+def _get_value_matrices_from_ranges(worksheet, a1_ranges: List[str]) -> List[List[List[Any]]]:
+    # A single values.batchGet call for all the ranges instead of one call per range
+    return [list(value_range) for value_range in worksheet.batch_get(a1_ranges)]
+
+
+def _row_range_to_a1_range(row_range: str) -> str:
+    first_row_number, last_row_number = [int(i) for i in row_range.split(':')]
+    return _rows_to_a1_range(first_row_number, last_row_number)
+
+
+def _pad_value_matrix_to_range(list_of_lists, row_range):
+    first_row_number, last_row_number = [int(i) for i in row_range.split(':')]
+    # The API leaves out trailing empty rows, keep one (empty) row per requested row number
+    missing_rows = (last_row_number - first_row_number + 1) - len(list_of_lists)
+    return list_of_lists + [[] for _ in range(missing_rows)]
 
 
 def _get_value_matrix_from_range(worksheet, row_range):
-    list_of_lists = []
-    row_numbers = [int(i) for i in row_range.split(':')]
-    first_row_number = row_numbers[0]
-    last_row_number = row_numbers[1]
-    for i in range(first_row_number, last_row_number + 1):
-        row = worksheet.row_values(i)
-        list_of_lists.append(row)
-    return list_of_lists
+    list_of_lists = _get_value_matrices_from_ranges(worksheet,
+                                                    [_row_range_to_a1_range(row_range)])[0]
+    return _pad_value_matrix_to_range(list_of_lists, row_range)
 
 
 def _get_value_matrix_from_skip(worksheet, data_start_row_number):
@@ -121,6 +148,16 @@ class SheetUtil:
         return _get_value_matrix_from_skip(worksheet=self._get_worksheet(),
                                            data_start_row_number=data_start_row_number)
 
+    def get_values_batch(self, row_ranges: List[str]) -> List[List[List[Any]]]:
+        """
+        Get the values of several row ranges of the sheet in a single API call
+        Args:
+            row_ranges (List[str]): ranges of the rows that need to be selected (eg: ['1:1', '3:7'])
+        Returns: one 2D array of values per requested range, trailing empty rows are not included
+        """
+        a1_ranges = [_row_range_to_a1_range(row_range) for row_range in row_ranges]
+        return _get_value_matrices_from_ranges(self._get_worksheet(), a1_ranges)
+
     def get_fields_names(self, field_names_row_number: int) -> List[str]:
         """
         Get the field names as a list
@@ -159,13 +196,28 @@ class SheetUtil:
             data_start_row_number (int): Starting row number of actual data
         Returns: field types list
         """
-        matrix = self.get_value_matrix(row_range, data_start_row_number)
-        return self._get_dataframe_from_matrix(field_names_row_number, field_types_row_number,
-                                               matrix)
-
-    def _get_dataframe_from_matrix(self, field_names_row_number, field_types_row_number, matrix):
+        field_rows = [
+            f"{field_names_row_number}:{field_names_row_number}",
+            f"{field_types_row_number}:{field_types_row_number}",
+        ]
+        if row_range:
+            # The field name, field type and data rows are all read in one batched call
+            names_matrix, types_matrix, data_matrix = self.get_values_batch(
+                field_rows + [row_range])
+            matrix = _pad_value_matrix_to_range(data_matrix, row_range)
+        else:
+            matrix = self.get_value_matrix(row_range, data_start_row_number)
+            names_matrix, types_matrix = self.get_values_batch(field_rows)
+        field_names = names_matrix[0] if names_matrix else []
+        field_types = types_matrix[0] if types_matrix else []
+        LOG.debug("Field names:\n%s", field_names)
+        LOG.debug("Field types:\n%s", field_types)
+        return self._get_dataframe_from_matrix(field_names, field_types, matrix)
+
+    @staticmethod
+    def _get_dataframe_from_matrix(field_names, field_types, matrix):
         tupled_data = _list_of_list_to_list_of_tuples(matrix)
-        field_names = self.get_fields_names(field_names_row_number)
         untyped_data_frame = DataFrame(data=tupled_data,
                                        columns=field_names)
-        return _get_typed_data_frame(data_frame=untyped_data_frame, data_types=self.get_fields_types(field_types_row_number), field_names=field_names)
+        return _get_typed_data_frame(data_frame=untyped_data_frame, data_types=field_types,
+                                     field_names=field_names)
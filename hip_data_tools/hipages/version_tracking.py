@@ -39,28 +39,51 @@ in a json file
 
 
 import argparse
+import ast
 import json
+import mmap
 import os
+import pickle
+import re
 import socket
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 import git
-import joblib
 from hip_data_tools.common import LOG as log
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 CLASS_DECORATOR_STRING = '@register_class_for_version_tracking'
 "string : Used to trigger identification of the class by the version tracker"
 
 METHOD_DECORATOR_STRING = '@register_method_for_version_tracking'
 "string : Used to trigger identification of the method by the version tracker"
 
+_COMMIT_LINE_PREFIX = '__commit__'
+"string : Marks the lines holding commit hashes in the batched git log output"
+
+_UNVERSIONED_KEYS = frozenset(
+    ['hostname', 'versioning_timestamp', 'aggregated_version'])
+"set : Keys of the version dictionary left out of the aggregated version"
+
 DEFINITION_MAPPING = {
     'class': CLASS_DECORATOR_STRING,
     'def': METHOD_DECORATOR_STRING
 }
 "dictionary: Used to map between the type and their respective decorator"
 
+DECLARATION_NODE_TYPES = {
+    'class': (ast.ClassDef,),
+    'def': (ast.FunctionDef, ast.AsyncFunctionDef)
+}
+"dictionary: Used to map between the type and their syntax tree nodes"
+
 
 def register_class_for_version_tracking(cls):
     """
@@ -157,16 +180,17 @@ def find_tracked_modules(file_list):
     files_with_tag = []
     definitions_with_tags = []
 
-    for path in file_list:
-        defs_with_tags_in_file = \
-            find_any_relevant_decorations_in_file(path)
-
-        definitions_with_tags = definitions_with_tags + defs_with_tags_in_file
+    # Scanning is dominated by file reads, so the files are read concurrently;
+    # map keeps the results in the order of file_list and re-raises any
+    # DecoratorError here
+    with ThreadPoolExecutor() as executor:
+        defs_with_tags_per_file = executor.map(
+            find_any_relevant_decorations_in_file, file_list)
 
-        if defs_with_tags_in_file:
-            files_with_tag.extend(
-                [path for _ in defs_with_tags_in_file]
-            )
+        for path, defs_with_tags_in_file in zip(file_list,
+                                                defs_with_tags_per_file):
+            definitions_with_tags.extend(defs_with_tags_in_file)
+            files_with_tag.extend([path for _ in defs_with_tags_in_file])
 
     return definitions_with_tags, files_with_tag
 
@@ -207,81 +231,111 @@ def check_for_decorated_declaration_in_file(path,
 
     """
 
-    lines_in_file = _load_file_lines_into_list(path)
+    # Cheap check first, most files do not mention the decorator at all
+    if not _file_mentions_decorator(path, decorating_string.lstrip('@')):
+        return []
 
-    lines_with_decorator =_find_lines_with_decorator(decorating_string,
-                                                      lines_in_file)
+    try:
+        return _find_decorated_declarations_in_syntax_tree(path,
+                                                           decorating_string,
+                                                           declaration)
+    except SyntaxError:
+        log.debug("Could not parse %s, scanning its lines for decorators",
+                  path)
+        return _scan_lines_for_decorated_declarations(path,
+                                                      decorating_string,
+                                                      declaration)
 
-    return _find_decorated_declarations(
-        declaration, lines_in_file, lines_with_decorator)
 
+def _file_mentions_decorator(path, decorator_name):
+    with open(path, 'rb') as file:
+        try:
+            with mmap.mmap(file.fileno(), 0,
+                           access=mmap.ACCESS_READ) as mapped:
+                return mapped.find(decorator_name.encode()) != -1
+        except (TypeError, ValueError, OSError):
+            # Empty files cannot be mapped, nor can files without a
+            # descriptor, scan those as text instead
+            pass
 
-def _find_decorated_declarations(declaration,
-                                 lines_in_file,
-                                 lines_with_decorator):
-    tagged_declarations = []
-    line_limit = len(lines_in_file) - 1
-    for decorator_indicies in lines_with_decorator:
-        tagged_declarations.extend(
-            _check_lines_after_declaration(declaration,
-                                           decorator_indicies,
-                                           lines_in_file,
-                                           line_limit))
+    with open(path, 'r') as file:
+        return any(decorator_name in line for line in file)
 
-    return tagged_declarations
 
+def _find_decorated_declarations_in_syntax_tree(path,
+                                                decorating_string,
+                                                declaration):
+    with open(path, 'r') as file:
+        tree = ast.parse(file.read(), filename=str(path))
 
-def _check_lines_after_declaration(declaration,
-                                   decorator_indicies,
-                                   lines_in_file,
-                                   line_limit):
-    tagged_declarations = []
-    for cur_line_index in range(decorator_indicies, line_limit + 1):
-        cur_line = lines_in_file[cur_line_index]
-        found_value = _check_line_for_declaration(cur_line,
-                                                  declaration,
-                                                  cur_line_index >= line_limit,
-                                                  decorator_indicies)
+    decorator_name = decorating_string.lstrip('@')
+    node_types = DECLARATION_NODE_TYPES[declaration]
 
-        if found_value is not None:
-            tagged_declarations.append(found_value)
-            break
+    decorated_nodes = [
+        node for node in ast.walk(tree)
+        if isinstance(node, node_types) and
+        any(_get_decorator_name(decorator) == decorator_name
+            for decorator in node.decorator_list)]
+
+    # ast.walk goes breadth first, so put the declarations back in file order
+    decorated_nodes.sort(key=lambda node: (node.lineno, node.col_offset))
+    return [node.name for node in decorated_nodes]
 
-    return tagged_declarations
 
+def _get_decorator_name(decorator):
+    if isinstance(decorator, ast.Call):
+        decorator = decorator.func
+    if isinstance(decorator, ast.Name):
+        return decorator.id
+    if isinstance(decorator, ast.Attribute):
+        return decorator.attr
+    return None
 
-def _check_line_for_declaration(cur_line,
-                                declaration,
-                                end_of_file,
-                                decorator_indicies):
-    declaration_in_line = cur_line.startswith(declaration + " ")
-    # Ignore the line if its empty string indicating whitespace,
-    # or if its another decorator
-    # and stop if its the end of the file
-    if (not cur_line or not cur_line.startswith("@")) \
-        and end_of_file and not declaration_in_line:
-        raise DecoratorError(declaration, cur_line, decorator_indicies)
 
-    out = None
-    if declaration_in_line:
-        out = _extract_declaration_name(declaration, cur_line)
+def _scan_lines_for_decorated_declarations(path,
+                                           decorating_string,
+                                           declaration):
+    decorator_pattern, declaration_pattern = \
+        _compile_declaration_patterns(decorating_string, declaration)
 
-    return out
+    tagged_declarations = []
+    # Line numbers of the decorators still waiting for their declaration
+    pending_decorator_line_numbers = []
+    line = ''
 
+    with open(path, 'r') as file:
+        for line_number, line in enumerate(file):
+            if decorator_pattern.match(line):
+                pending_decorator_line_numbers.append(line_number)
+                continue
+
+            if not pending_decorator_line_numbers:
+                continue
+
+            declaration_match = declaration_pattern.match(line)
+            if declaration_match is not None:
+                declaration_name = _extract_declaration_name(
+                    declaration, declaration_match.group(0))
+                tagged_declarations.extend(
+                    [declaration_name] * len(pending_decorator_line_numbers))
+                pending_decorator_line_numbers.clear()
+
+    if pending_decorator_line_numbers:
+        last_line = '' if line.endswith("\n") else line.strip()
+        raise DecoratorError(declaration,
+                             last_line,
+                             pending_decorator_line_numbers[0])
 
-def _find_lines_with_decorator(decorating_string, lines_in_file):
-    # find index of lines with decorator
-    lines_with_decorator = []
-    for idx, line in enumerate(lines_in_file):
-        if line.startswith(decorating_string):
-            lines_with_decorator.append(idx)
-    return lines_with_decorator
+    return tagged_declarations
 
 
-def _load_file_lines_into_list(path):
-    with open(path, 'r') as file:
-        lines_in_file = [line.strip() for line in file.readlines()]
-    return lines_in_file
+@lru_cache(maxsize=None)
+def _compile_declaration_patterns(decorating_string, declaration):
+    decorator_pattern = re.compile(
+        r"[^\S\n]*" + re.escape(decorating_string))
+    declaration_pattern = re.compile(
+        r"[^\S\n]*" + re.escape(declaration) + r" .*$")
+    return decorator_pattern, declaration_pattern
 
 
 def _extract_declaration_name(declaration, line):
@@ -304,13 +358,75 @@ def get_latest_git_hash_of_files_in_repo(repo, files_to_get):
     Returns: list of git hashes for the file paths supplied
 
     """
-    git_hashes = []
+    if not hasattr(repo, 'git'):
+        return [_get_latest_git_hash_of_file(repo, path)
+                for path in files_to_get]
 
-    for path in files_to_get:
-        commit = next(repo.iter_commits(paths=path, max_count=1))
-        git_hashes.append(commit.hexsha)
+    latest_git_hashes = _get_latest_git_hashes_from_log(repo, files_to_get)
 
-    return git_hashes
+    # Any file the single log walk could not attribute is looked up on its own
+    return [latest_git_hashes.get(path) or
+            _get_latest_git_hash_of_file(repo, path)
+            for path in files_to_get]
+
+
+def _get_latest_git_hash_of_file(repo, path):
+    commit = next(repo.iter_commits(paths=path, max_count=1))
+    return commit.hexsha
+
+
+def _get_latest_git_hashes_from_log(repo, files_to_get):
+    """
+    Walks the history of all the files in a single git log invocation, and
+    keeps the first (latest) commit in which each file shows up. The walk
+    stops as soon as every file has a commit.
+    Git simplifies the history of a merge for all the paths at once rather
+    than per file, so when a merge touches any of the files nothing is
+    returned and every file is looked up on its own instead
+    Args:
+        repo: git Repo object
+        files_to_get: list of absolute or relative paths of files, relative
+            paths being relative to the root of the repo
+
+    Returns: dictionary of the supplied paths and their latest git hash
+
+    """
+    repo_root = os.path.realpath(repo.working_tree_dir)
+    paths_by_repo_path = {
+        Path(os.path.relpath(
+            os.path.realpath(os.path.join(repo_root, path)),
+            repo_root)).as_posix(): path
+        for path in set(files_to_get)}
+
+    if repo.git.rev_list('--merges', '--max-count=1', 'HEAD', '--',
+                         *paths_by_repo_path):
+        return {}
+
+    process = repo.git.log('--name-only',
+                           '--format={}%H'.format(_COMMIT_LINE_PREFIX),
+                           'HEAD',
+                           '--',
+                           *paths_by_repo_path,
+                           as_process=True)
+
+    latest_git_hashes = {}
+    current_hash = None
+    try:
+        for raw_line in process.proc.stdout:
+            line = raw_line.decode().rstrip('\n')
+            if line.startswith(_COMMIT_LINE_PREFIX):
+                current_hash = line[len(_COMMIT_LINE_PREFIX):]
+            elif line in paths_by_repo_path:
+                latest_git_hashes.setdefault(paths_by_repo_path[line],
+                                             current_hash)
+                if len(latest_git_hashes) == len(paths_by_repo_path):
+                    break
+    finally:
+        # Stops git walking the rest of the history once we are done
+        process.proc.kill()
+        process.proc.wait()
+
+    return latest_git_hashes
 
 
 def find_relevant_file_versions(package_location, repo_location):
@@ -370,6 +486,39 @@ def find_and_export_relevant_versions(path,
     write_versions_to_json(versions_dict, output_location)
 
 
+def _loads_json(content):
+    # orjson is optional and much faster on large version files, its
+    # JSONDecodeError subclasses json.decoder.JSONDecodeError
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def _joblib_hash(obj):
+    # joblib is only imported once something is hashed, so that importing
+    # this module for its decorators stays cheap
+    import joblib
+
+    return joblib.hash(obj)
+
+
+def xxhash_fn(obj):
+    """
+    Hashes an object with the non cryptographic xxh3 128 bit hash of its
+    pickle, which is much faster than MD5 for large objects such as models.
+    Requires the optional xxhash package, installed with the xxhash extra:
+    pip install hip_data_tools[xxhash]
+    Args:
+        obj (Object): Any picklable object
+
+    Returns (str): hex digest of the object
+
+    """
+    import xxhash
+
+    return xxhash.xxh3_128_hexdigest(pickle.dumps(obj, protocol=5))
+
+
 class DecoratorError(Exception):
     """
     Error raised when there is a problem with the decoration of a class or
@@ -397,11 +546,19 @@ class VersionTracker:
     generating a dictionary. Versions can be loaded from file or can be
     generated on the fly from object hashes
 
+    Args:
+        hash_fn (Callable): function turning an object into a hex digest
+            string, joblib.hash (MD5 of the pickled object) by default. Use
+            xxhash_fn for a faster, non cryptographic hash of large objects
+
     """
 
-    def __init__(self):
+    def __init__(self, hash_fn=None):
 
         self._version_dict = {}
+        self._hash_fn = hash_fn if hash_fn is not None else _joblib_hash
+        # Aggregated hash of the versions, reset whenever a version changes
+        self._aggregated_version = None
 
     def add_dictionary_to_versions(self, in_dict):
         """
@@ -414,6 +571,8 @@ class VersionTracker:
         """
 
         self._version_dict.update(in_dict)
+        if not _UNVERSIONED_KEYS.issuperset(in_dict):
+            self._aggregated_version = None
 
     def add_versions_from_json_file(self, version_file_location):
         """
@@ -426,9 +585,9 @@ class VersionTracker:
 
         """
         try:
-            with open(version_file_location, "r") as content:
+            with open(version_file_location, "rb") as content:
                 file_content = content.read()
-                version_dict_from_file = json.loads(file_content)
+                version_dict_from_file = _loads_json(file_content)
 
                 self.add_dictionary_to_versions(version_dict_from_file)
 
@@ -463,7 +622,30 @@ class VersionTracker:
         Returns: None
         """
 
-        self.add_dictionary_to_versions({dict_key: joblib.hash(obj)})
+        self.add_object_versions({dict_key: obj})
+
+    def add_object_versions(self, objects):
+        """Adds hashes of several objects to the version tracking. An object
+        registered under more than one name in the same call is only hashed
+        once, objects are hashed again on every call so that changes to them
+        are picked up
+        Args:
+            objects (dict): Names to be used in the version tracking
+                dictionary and the objects to hash for them
+
+        Returns: None
+        """
+
+        # Keyed by id, the objects stay referenced by the objects dict for
+        # the whole call so their ids cannot be recycled
+        hashes_by_id = {}
+        versions = {}
+        for dict_key, obj in objects.items():
+            if id(obj) not in hashes_by_id:
+                hashes_by_id[id(obj)] = self._hash_fn(obj)
+            versions[dict_key] = hashes_by_id[id(obj)]
+
+        self.add_dictionary_to_versions(versions)
 
     def add_string_to_version_tracking(self, dict_key, in_string):
         """
@@ -483,22 +665,24 @@ class VersionTracker:
     def _set_agglomerated_version_hash(self):
         """
         This hash takes all of the versioning hashes and combines them to
-        produce a single hash of everything excluding the timestamp and
-        hostname. This should, therefore, provide a single hash which
-        encapsulates the software versions.
+        produce a single hash of everything excluding the timestamp,
+        hostname and any previous aggregated hash. This should, therefore,
+        provide a single hash which encapsulates the software versions. The
+        hash is only recomputed when a version was added since the last call.
 
         Returns: None
 
         """
-        relevant_versions = {x: self._version_dict[x]
-                             for x in self._version_dict if x not in
-                             ['hostname', 'versioning_timestamp']}
+        if self._aggregated_version is None:
+            relevant_versions = {x: self._version_dict[x]
+                                 for x in self._version_dict if x not in
+                                 _UNVERSIONED_KEYS}
 
-        version_hash = joblib.hash(json.dumps(relevant_versions,
-                                              sort_keys=True)
-                                   )
+            self._aggregated_version = _joblib_hash(
+                json.dumps(relevant_versions, sort_keys=True))
 
-        self.add_dictionary_to_versions({'aggregated_version': version_hash})
+        self.add_dictionary_to_versions(
+            {'aggregated_version': self._aggregated_version})
 
     def _add_versioning_timestamp(self):
         self.add_dictionary_to_versions({'versioning_timestamp': \
@@ -508,14 +692,17 @@ class VersionTracker:
         """
         Brings together all of the required versioning information and
         returns the relevant dictionary
-        Returns (dict): Dictionary which tracks all of the tracked versions
+        Returns (dict): Copy of the dictionary which tracks all of the tracked
+            versions, changing it does not affect the tracker
         """
 
         self._set_agglomerated_version_hash()
         self._add_hostname()
         self._add_versioning_timestamp()
 
-        return self._version_dict
+        # A copy, so changes made by the caller cannot leave the cached
+        # aggregated version stale
+        return dict(self._version_dict)
 
 
 def main():
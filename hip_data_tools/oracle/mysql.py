@@ -2,9 +2,11 @@
 Utility to read and write from and to mysql
 """
 from builtins import str
-from contextlib import closing
+from contextlib import closing, contextmanager
 from dataclasses import dataclass
-from typing import Optional, Dict, Tuple, Any, Union
+from functools import lru_cache
+from queue import LifoQueue, Empty, Full
+from typing import Optional, Dict, Tuple, Any, Union, List
 
 import MySQLdb
 import pandas.io.sql as sql
@@ -26,22 +28,60 @@ def prepare_upsert_query(table: str, primary_keys: Dict[str, Any],
     Returns: str, Tuple
 
     """
-    pk_columns = primary_keys.keys()
-    data_columns = data.keys()
+    query = _get_upsert_query_template(table, tuple(primary_keys), tuple(data))
+    values = tuple(list(primary_keys.values()) + list(data.values()))
+
+    return query, values
+
+
+@lru_cache(maxsize=128)
+def _get_upsert_query_template(table: str, pk_columns: Tuple[str, ...],
+                               data_columns: Tuple[str, ...]) -> str:
     pk_col_list = ", ".join(pk_columns)
     data_col_list = ", ".join(data_columns)
     parameter_list = ",".join(["%s" for _ in pk_columns] + ["%s" for _ in data_columns])
     update_list = ", ".join([f"{col}=%s" for col in data_columns])
-    values = tuple(list(primary_keys.values()) + list(data.values()))
-    query = f"""
+    return f"""
     INSERT INTO {table} ({pk_col_list}, {data_col_list})
     VALUES ({parameter_list})
     ON DUPLICATE KEY UPDATE {update_list}
     """
 
+
+def prepare_bulk_upsert_query(table: str, primary_key_names: List[str], data_names: List[str],
+                              rows: List[Dict[str, Any]]) -> Tuple[str, List[Tuple]]:
+    """
+    Helper to prep an upsert query for many rows at once, to be run with cursor.executemany which
+    sends all the rows to mysql in a single multi row insert
+    Args:
+        table (str): the upsert statement will be prepared for this table
+        primary_key_names (List[str]): names of the primary key columns
+        data_names (List[str]): names of the non primary key columns
+        rows (List[Dict[str, Any]]): dictionaries of column names and values, one for each row
+
+    Returns: str, List[Tuple]
+
+    """
+    columns = list(primary_key_names) + list(data_names)
+    query = _get_bulk_upsert_query_template(table, tuple(primary_key_names), tuple(data_names))
+    values = [tuple(row[column] for column in columns) for row in rows]
+
     return query, values
 
 
+@lru_cache(maxsize=128)
+def _get_bulk_upsert_query_template(table: str, pk_columns: Tuple[str, ...],
+                                    data_columns: Tuple[str, ...]) -> str:
+    col_list = ", ".join(pk_columns + data_columns)
+    parameter_list = ",".join(["%s" for _ in pk_columns + data_columns])
+    update_list = ", ".join([f"{col}=VALUES({col})" for col in data_columns])
+    return f"""
+    INSERT INTO {table} ({col_list})
+    VALUES ({parameter_list})
+    ON DUPLICATE KEY UPDATE {update_list}
+    """
+
+
 class MySqlSecretsManager(SecretsManager):
     """
     Secrets manager for MySql configuration
@@ -80,11 +120,13 @@ class MySqlConnectionManager:
 
     Args:
         settings (MySqlConnectionSettings): settings to use for connecting to a database
+        pool_size (int): maximum number of idle connections kept around for reuse
     """
 
-    def __init__(self, settings: MySqlConnectionSettings):
+    def __init__(self, settings: MySqlConnectionSettings, pool_size: int = 25):
         self._settings = settings
         self._conn_config = {}
+        self._pool = LifoQueue(maxsize=pool_size)
 
     def get_conn(self):
         """
@@ -96,6 +138,60 @@ class MySqlConnectionManager:
         self._prepare_connection_config()
         return MySQLdb.connect(**self._conn_config)
 
+    @contextmanager
+    def pooled_conn(self):
+        """
+        Borrow a connection from the pool, opening a new one when no idle connection is left.
+        The connection goes back to the pool once the block finishes, unless it raised, after
+        rolling back whatever is left of its transaction so that the next borrower starts afresh.
+
+        Returns: MySql connection object
+
+        """
+        conn = self._get_idle_conn()
+        try:
+            yield conn
+        except Exception:
+            conn.close()
+            raise
+        try:
+            # Ends the open transaction, releasing its snapshot and metadata locks, nothing that
+            # was committed inside the block is affected
+            conn.rollback()
+        except MySQLdb.Error:
+            LOG.debug("Discarding a mysql connection that failed to roll back")
+            conn.close()
+            return
+        try:
+            self._pool.put_nowait(conn)
+        except Full:
+            conn.close()
+
+    def close_pool(self) -> None:
+        """
+        Close all the idle connections held in the pool
+
+        Returns: None
+
+        """
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except Empty:
+                return
+
+    def _get_idle_conn(self):
+        while True:
+            try:
+                conn = self._pool.get_nowait()
+            except Empty:
+                return self.get_conn()
+            try:
+                conn.ping()
+                return conn
+            except MySQLdb.OperationalError:
+                LOG.debug("Discarding a pooled mysql connection that is no longer alive")
+
     def _prepare_connection_config(self):
         self._conn_config = {
             "user": self._settings.secrets_manager.username,
@@ -150,7 +246,7 @@ class MySqlUtil:
 
         """
         LOG.info("Executing \n %s", query)
-        with closing(self._conn_mgr.get_conn()) as connection:
+        with self._conn_mgr.pooled_conn() as connection:
             df = sql.read_sql(query, connection)
         LOG.info("Sql Data frame size: %s", df.shape[0])
         LOG.debug(df.head(2))
@@ -170,6 +266,29 @@ class MySqlUtil:
         query, values = prepare_upsert_query(table=table, primary_keys=primary_keys, data=data)
         self.execute(query=query, values=values)
 
+    def bulk_upsert(self, table: str, primary_key_names: List[str], data_names: List[str],
+                    rows: List[Dict[str, Any]]) -> None:
+        """
+        upsert many rows into a table in a single statement
+        Args:
+            table (str): the upsert statement will be prepared for this table
+            primary_key_names (List[str]): names of the primary key columns
+            data_names (List[str]): names of the non primary key columns
+            rows (List[Dict[str, Any]]): dictionaries of column names and values, one for each row
+
+        Returns: None
+
+        """
+        query, values = prepare_bulk_upsert_query(table=table,
+                                                  primary_key_names=primary_key_names,
+                                                  data_names=data_names,
+                                                  rows=rows)
+        LOG.info("Executing for %s rows \n %s", len(values), query)
+        with self._conn_mgr.pooled_conn() as conn:
+            with closing(conn.cursor()) as cur:
+                cur.executemany(query, values)
+            conn.commit()
+
     def execute(self, query: str, values: Optional[Tuple] = None) -> None:
         """
         execute standalone SQL statements in a mysql database
@@ -181,13 +300,13 @@ class MySqlUtil:
 
         """
         LOG.info("Executing \n %s", query)
-        conn = self._conn_mgr.get_conn()
-        cur = conn.cursor()
-        if values:
-            cur.execute(query, values)
-        else:
-            cur.execute(query)
-        conn.commit()
+        with self._conn_mgr.pooled_conn() as conn:
+            with closing(conn.cursor()) as cur:
+                if values:
+                    cur.execute(query, values)
+                else:
+                    cur.execute(query)
+            conn.commit()
 
     def get_table_metadata(self, table: str) -> Dict:
         """
@@ -68,7 +68,6 @@ setup(
     entry_points={'console_scripts': [
         'version-tracker=hip_data_tools.hipages.version_tracking:main']},
     install_requires=[
-        "stringcase",
         "attrs",
         "joblib",
         "pandas",
@@ -87,6 +86,9 @@ setup(
         "mysqlclient>=1.3.6,<=2.1",
         "boto3",
     ],
+    extras_require={
+        "xxhash": ["xxhash"],
+    },
     test_suite="tests",
     tests_require=[
         'pytest',
@@ -99,6 +101,7 @@ setup(
         "testcontainers",
         "ecdsa==0.14.1",
         "cfn-lint==0.58.4",
+        "xxhash",
     ],
     cmdclass={'test': PyTest},
     python_requires='~=3.9',
@@ -2,7 +2,7 @@ import datetime
 import os
 import uuid
 from unittest import TestCase
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 import pandas as pd
 from pandas import DataFrame
 from pandas._libs.tslibs.nattype import NaT
@@ -181,9 +181,9 @@ class TestCassandraUtil(TestCase):
         self.assertRaises(Exception, func)
 
     def test__cassandra_secrets_manager_should_instantiate_with_sensible_defaults(self):
-        os.environ["CASSANDRA_USERNAME"] = "abc"
-        os.environ["CASSANDRA_PASSWORD"] = "def"
-        actual = CassandraSecretsManager()
+        with patch.dict(os.environ, {"CASSANDRA_USERNAME": "abc",
+                                     "CASSANDRA_PASSWORD": "def"}):
+            actual = CassandraSecretsManager()
         self.assertEqual(actual.username, "abc")
         self.assertEqual(actual.password, "def")
 
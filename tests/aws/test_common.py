@@ -1,14 +1,14 @@
 import os
-from unittest import TestCase
+from unittest import TestCase, mock
 from hip_data_tools.aws.common import AwsSecretsManager
 
 
 class TestAws(TestCase):
 
     def test__aws_secrets_manager_should_instantiate_with_sensible_defaults(self):
-        os.environ["AWS_ACCESS_KEY_ID"] = "abc"
-        os.environ["AWS_SECRET_ACCESS_KEY"] = "def"
-        actual = AwsSecretsManager()
+        with mock.patch.dict(os.environ, {"AWS_ACCESS_KEY_ID": "abc",
+                                          "AWS_SECRET_ACCESS_KEY": "def"}):
+            actual = AwsSecretsManager()
         self.assertEqual(actual.aws_access_key_id, "abc")
         self.assertEqual(actual.aws_secret_access_key, "def")
 
@@ -8,6 +8,7 @@ from moto import mock_s3
 from pandas.testing import assert_frame_equal
 from hip_data_tools.aws.common import AwsConnectionManager, AwsConnectionSettings, AwsSecretsManager
 from hip_data_tools.aws.s3 import S3Util, _multi_process_upload_file
+from hip_data_tools.common import DictKeyValueSource
 
 
 class TestS3Util(TestCase):
@@ -15,7 +16,12 @@ class TestS3Util(TestCase):
     def setUpClass(cls):
         cls.bucket = "TEST_BUCKET"
         conn = AwsConnectionManager(
-            AwsConnectionSettings(region="us-east-1", secrets_manager=AwsSecretsManager(),
+            AwsConnectionSettings(region="us-east-1",
+                                  secrets_manager=AwsSecretsManager(source=DictKeyValueSource({
+                                      "AWS_ACCESS_KEY_ID": "abc",
+                                      "AWS_SECRET_ACCESS_KEY": "def",
+                                      "AWS_SESSION_TOKEN": None,
+                                  })),
                                   profile=None))
         cls.s3 = S3Util(conn=conn, bucket=cls.bucket)
 
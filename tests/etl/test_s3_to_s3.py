@@ -1,4 +1,5 @@
 from tempfile import NamedTemporaryFile
+from unittest.mock import patch
 from unittest import TestCase
 from moto import mock_s3
 from hip_data_tools.aws.common import AwsConnectionManager, AwsConnectionSettings, AwsSecretsManager
@@ -9,8 +10,20 @@ from hip_data_tools.etl.s3_to_s3 import S3ToS3FileCopy
 
 
 class TestS3ToS3(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.mock = mock_s3()
+        cls.mock.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.mock.stop()
+
+    def setUp(self):
+        # Wipe the in-memory buckets between tests instead of re-entering the mock every time
+        for backend in self.mock.backends.values():
+            backend.reset()
 
-    @mock_s3
     def test__list_source_files__should_work_without_suffix(self):
         aws_setting = AwsConnectionSettings(
             region="us-east-1",
@@ -26,7 +39,7 @@ class TestS3ToS3(TestCase):
         s3_util_for_destination.create_bucket()
 
         file = NamedTemporaryFile("w+", delete=False)
-        file.write(str("Test file content"))
+        file.write("Test file content")
 
         s3_util_for_source.upload_file(file.name, "source/prefix/test_file.txt")
         etl = S3ToS3FileCopy(
@@ -45,7 +58,6 @@ class TestS3ToS3(TestCase):
         expected_source_list = ['source/prefix/test_file.txt']
         self.assertListEqual(etl.list_source_files(), expected_source_list)
 
-    @mock_s3
     def test__list_source_files__should_work_with_suffix(self):
         aws_setting = AwsConnectionSettings(
             region="us-east-1",
@@ -61,12 +73,12 @@ class TestS3ToS3(TestCase):
         s3_util_for_destination.create_bucket()
 
         file = NamedTemporaryFile("w+", delete=False)
-        file.write(str("Test file content"))
+        file.write("Test file content")
 
         s3_util_for_source.upload_file(file.name, "source/prefix/test_file.txt")
 
         file2 = NamedTemporaryFile("w+", delete=False)
-        file2.write(str("Test file content"))
+        file2.write("Test file content")
         s3_util_for_source.upload_file(file2.name, "source/prefix/txt_file.parquet")
         etl = S3ToS3FileCopy(
             source=s3.S3SourceSettings(
@@ -84,7 +96,6 @@ class TestS3ToS3(TestCase):
         expected_source_list = ['source/prefix/test_file.txt']
         self.assertListEqual(etl.list_source_files(), expected_source_list)
 
-    @mock_s3
     def test__transfer_file__should_work(self):
         aws_setting = AwsConnectionSettings(
             region="us-east-1",
@@ -100,12 +111,12 @@ class TestS3ToS3(TestCase):
         s3_util_for_destination.create_bucket()
 
         file = NamedTemporaryFile("w+", delete=False)
-        file.write(str("Test file content"))
+        file.write("Test file content")
 
         s3_util_for_source.upload_file(file.name, "source/prefix/test_file.txt")
 
         file2 = NamedTemporaryFile("w+", delete=False)
-        file2.write(str("Test file content"))
+        file2.write("Test file content")
         s3_util_for_source.upload_file(file2.name, "source/prefix/txt_file.parquet")
         etl = S3ToS3FileCopy(
             source=s3.S3SourceSettings(
@@ -125,7 +136,6 @@ class TestS3ToS3(TestCase):
         expected_destination_keys = ['target/prefix/test_file.txt']
         self.assertListEqual(expected_destination_keys, actual)
 
-    @mock_s3
     def test__transfer_all_files__should_work(self):
         aws_setting = AwsConnectionSettings(
             region="us-east-1",
@@ -142,7 +152,7 @@ class TestS3ToS3(TestCase):
 
         for itr in range(10):
             file = NamedTemporaryFile("w+", delete=False)
-            file.write(str("Test file content"))
+            file.write("Test file content")
             s3_util_for_source.upload_file(file.name, f"source/prefix/txt_file{itr}.parquet")
 
         etl = S3ToS3FileCopy(
@@ -161,9 +171,8 @@ class TestS3ToS3(TestCase):
         etl.execute_all()
         actual = s3_util_for_destination.get_keys("")
         expected_destination_keys = [f'target/prefix/txt_file{itr}.parquet' for itr in range(10)]
-        self.assertListEqual(expected_destination_keys, actual)
+        self.assertCountEqual(expected_destination_keys, actual)
 
-    @mock_s3
     def test__transfer_all_files__should_work_without_transformers(self):
         aws_setting = AwsConnectionSettings(
             region="us-east-1",
@@ -180,7 +189,7 @@ class TestS3ToS3(TestCase):
 
         for itr in range(10):
             file = NamedTemporaryFile("w+", delete=False)
-            file.write(str("Test file content"))
+            file.write("Test file content")
             s3_util_for_source.upload_file(file.name, f"source/prefix/txt_file{itr}.parquet")
 
         etl = S3ToS3FileCopy(
@@ -198,4 +207,78 @@ class TestS3ToS3(TestCase):
         etl.execute_all()
         actual = s3_util_for_destination.get_keys("")
         expected_destination_keys = [f'source/prefix/txt_file{itr}.parquet' for itr in range(10)]
-        self.assertListEqual(expected_destination_keys, actual)
+        self.assertCountEqual(expected_destination_keys, actual)
+        self.assertFalse(etl.has_next())
+
+    def test__execute_all__should_only_copy_the_remaining_files(self):
+        aws_setting = AwsConnectionSettings(
+            region="us-east-1",
+            secrets_manager=AwsSecretsManager(),
+            profile=None)
+        source_bucket = "TEST_SOURCE_BUCKET"
+        target_bucket = "TEST_TARGET_BUCKET"
+        conn = AwsConnectionManager(aws_setting)
+        s3_util_for_destination = S3Util(conn=conn, bucket=target_bucket)
+        s3_util_for_source = S3Util(conn=conn, bucket=source_bucket)
+
+        s3_util_for_source.create_bucket()
+        s3_util_for_destination.create_bucket()
+
+        for itr in range(10):
+            file = NamedTemporaryFile("w+", delete=False)
+            file.write("Test file content")
+            s3_util_for_source.upload_file(file.name, f"source/prefix/txt_file{itr}.parquet")
+
+        etl = S3ToS3FileCopy(
+            source=s3.S3SourceSettings(
+                bucket=source_bucket,
+                key_prefix="source/prefix",
+                suffix=None,
+                connection_settings=aws_setting,
+            ),
+            sink=s3.S3SinkSettings(
+                bucket=target_bucket,
+                connection_settings=aws_setting,
+            ),
+        )
+        copied_keys = []
+        original_load = s3.S3FileCopyLoader.load
+
+        def load(loader, data):
+            copied_keys.append(data[1])
+            original_load(loader, data)
+
+        with patch.object(s3.S3FileCopyLoader, "load", autospec=True, side_effect=load):
+            etl.execute_next()
+            etl.execute_next()
+            etl.execute_all()
+
+        expected_keys = [f'source/prefix/txt_file{itr}.parquet' for itr in range(10)]
+        self.assertCountEqual(expected_keys, copied_keys)
+        self.assertCountEqual(expected_keys, s3_util_for_destination.get_keys(""))
+        self.assertFalse(etl.has_next())
+
+    def test__load_all__should_pull_data_only_as_copies_complete(self):
+        aws_setting = AwsConnectionSettings(
+            region="us-east-1",
+            secrets_manager=AwsSecretsManager(),
+            profile=None)
+        loader = s3.S3FileCopyLoader(s3.S3SinkSettings(
+            bucket="TEST_TARGET_BUCKET",
+            connection_settings=aws_setting,
+        ))
+        max_workers = 2
+        pulled = []
+        loaded = []
+
+        def data():
+            for itr in range(20):
+                # Never more than twice max_workers items are pulled ahead of the copies
+                self.assertLessEqual(len(pulled) - len(loaded), 2 * max_workers)
+                pulled.append(itr)
+                yield "TEST_SOURCE_BUCKET", f"source/txt_file{itr}", None
+
+        with patch.object(s3.S3FileCopyLoader, "load", side_effect=loaded.append):
+            loader.load_all(data(), max_workers=max_workers)
+
+        self.assertEqual(20, len(loaded))
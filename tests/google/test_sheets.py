@@ -1,4 +1,15 @@
+from datetime import datetime, timedelta
 from unittest import TestCase
+from unittest.mock import Mock, patch
+
+import rsa
+from pandas import DataFrame
+from pandas.testing import assert_frame_equal
+
+from hip_data_tools.common import DictKeyValueSource
+from hip_data_tools.google.common import GoogleApiConnectionSettings, GoogleApiSecretsManager
+from hip_data_tools.google.sheets import SheetUtil, GoogleSheetConnectionManager, \
+    _get_value_matrix_from_range
 
 
 class TestS3Util(TestCase):
@@ -13,3 +24,77 @@ class TestS3Util(TestCase):
     def integration_test_should__return_the_values_in_a_given_google_sheet__when_using_sheetUtil(
             self):
         pass
+
+
+class TestSheetUtilValueMatrix(TestCase):
+
+    def test__get_value_matrix_from_range__should_read_all_rows_in_one_call(self):
+        worksheet = Mock()
+        worksheet.batch_get.return_value = [[["a", "b"], [], ["c"]]]
+
+        actual = _get_value_matrix_from_range(worksheet=worksheet, row_range="3:7")
+
+        worksheet.batch_get.assert_called_once_with(["A3:7"])
+        worksheet.row_values.assert_not_called()
+        self.assertEqual([["a", "b"], [], ["c"], [], []], actual)
+
+    def test__get_dataframe__should_read_field_rows_and_data_in_one_call(self):
+        worksheet = Mock()
+        worksheet.batch_get.return_value = [
+            [["id", "name"]], [["NUMBER", "STRING"]], [["1", "x"], ["2", "y"]],
+        ]
+        conn_manager = Mock()
+        conn_manager.get_client.return_value.open_by_url.return_value.worksheet.return_value = \
+            worksheet
+        sheet_util = SheetUtil(conn_manager=conn_manager, workbook_url="url", sheet="sheet")
+
+        actual = sheet_util.get_dataframe(field_names_row_number=1, field_types_row_number=2,
+                                          row_range="3:4")
+
+        worksheet.batch_get.assert_called_once_with(["A1:1", "A2:2", "A3:4"])
+        assert_frame_equal(DataFrame({"id": [1, 2], "name": ["x", "y"]}), actual)
+
+
+class TestGoogleSheetConnectionManager(TestCase):
+
+    @patch.dict(GoogleSheetConnectionManager._shared_clients, clear=True)
+    @patch("hip_data_tools.google.common.ServiceAccountCredentials")
+    @patch("hip_data_tools.google.sheets.gspread.authorize")
+    def test__get_client__should_share_the_client_for_the_same_credentials(self, authorize, _):
+        authorize.side_effect = lambda credentials: Mock()
+
+        def manager(key_json):
+            return GoogleSheetConnectionManager(GoogleApiConnectionSettings(
+                secrets_manager=GoogleApiSecretsManager(
+                    source=DictKeyValueSource({"key_json": key_json}))))
+
+        first = manager({"client_email": "a@b.com"}).get_client()
+        second = manager({"client_email": "a@b.com"}).get_client()
+        other = manager({"client_email": "c@d.com"}).get_client()
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+        self.assertEqual(2, authorize.call_count)
+
+    @patch.dict(GoogleSheetConnectionManager._shared_clients, clear=True)
+    @patch("requests.Session.request", return_value=Mock(ok=True))
+    @patch("google.oauth2._client.jwt_grant")
+    def test__get_client__should_reuse_the_access_token(self, jwt_grant, _):
+        jwt_grant.return_value = ("token", datetime.utcnow() + timedelta(hours=1), {})
+        _, private_key = rsa.newkeys(1024)
+        key_json = {
+            "type": "service_account",
+            "client_email": "a@b.com",
+            "client_id": "1",
+            "private_key_id": "1",
+            "private_key": private_key.save_pkcs1().decode(),
+            "token_uri": "https://oauth2.googleapis.com/token",
+        }
+        settings = GoogleApiConnectionSettings(
+            secrets_manager=GoogleApiSecretsManager(
+                source=DictKeyValueSource({"key_json": key_json})))
+
+        GoogleSheetConnectionManager(settings).get_client().http_client.request("get", "url")
+        GoogleSheetConnectionManager(settings).get_client().http_client.request("get", "url")
+
+        jwt_grant.assert_called_once()
@@ -0,0 +1,51 @@
+import pytest
+
+DECORATOR_STRING = "@decorator_string"
+TYPE_DEFINITION = "class"
+
+
+@pytest.fixture(scope='session')
+def decorator_string():
+    return DECORATOR_STRING
+
+
+@pytest.fixture(scope='session')
+def type_definition():
+    return TYPE_DEFINITION
+
+
+@pytest.fixture(scope='session')
+def decorated_class_source():
+    return """import foo
+    import pandas as pd
+    
+    {}
+    {} ClassToBeTracked
+        def __init__(self): 
+            self.foo = 1 
+    
+    {} ClassToBeIgnored    
+    """.format(DECORATOR_STRING, TYPE_DEFINITION, TYPE_DEFINITION)
+
+
+@pytest.fixture(scope='session')
+def multiple_decorated_classes_source():
+    return """import foo
+    import pandas as pd
+    
+    {}
+    {} ClassToBeTracked
+        def __init__(self): 
+            self.foo = 1 
+    
+    {} ClassToBeIgnored
+    
+    {}
+    {} AnotherClassToBeTracked
+        def __init__(self): 
+            self.foo = 1     
+    """.format(DECORATOR_STRING,
+               TYPE_DEFINITION,
+               TYPE_DEFINITION,
+               DECORATOR_STRING,
+               TYPE_DEFINITION)
@@ -1,6 +1,7 @@
 import json
 import uuid
 from unittest.mock import mock_open, patch
+import git
 import pytest
 from freezegun import freeze_time
 from joblib import hash
@@ -43,26 +44,13 @@ def test__python_can_extract_fld_from_pkg_file(mocker):
     assert (found_location == '/foo/bar/')
 
 
-def test__check_for_decorated_classes_in_file(mocker):
-    some_decorated_string = "@decorator_string"
-    type_definiton = "class"
-    example_file = """import foo
-    import pandas as pd
-    
-    {}
-    {} ClassToBeTracked
-        def __init__(self): 
-            self.foo = 1 
-    
-    {} ClassToBeIgnored    
-    """.format(some_decorated_string, type_definiton, type_definiton)
-    #
-    m = mock_open(read_data=example_file)
-    with patch('builtins.open', m, create=True):
-        classes_with_tag = \
-            vt.check_for_decorated_declaration_in_file('some/mocked/file/path',
-                                                       some_decorated_string,
-                                                       type_definiton)
+def test__check_for_decorated_classes_in_file(decorated_class_source, monkeypatch,
+                                              decorator_string, type_definition):
+    monkeypatch.setattr('builtins.open', mock_open(read_data=decorated_class_source))
+    classes_with_tag = \
+        vt.check_for_decorated_declaration_in_file('some/mocked/file/path',
+                                                   decorator_string,
+                                                   type_definition)
 
     assert (len(classes_with_tag) == 1)
 
@@ -98,6 +86,57 @@ def test__check_for_file_with_no_decorarted_classes(mocker):
     assert (len(files_with_tag) == 0)
 
 
+def test__find_tracked_modules_should_keep_the_order_of_the_files(mocker):
+    file_contents = {
+        'first/file.py': "@register_class_for_version_tracking\n"
+                         "class FirstClass:\n",
+        'second/file.py': "@register_method_for_version_tracking\n"
+                          "def second_method():\n"
+                          "@register_class_for_version_tracking\n"
+                          "class SecondClass:\n",
+    }
+
+    def open_file(path, *args, **kwargs):
+        return mock_open(read_data=file_contents[path])()
+
+    with patch("builtins.open", side_effect=open_file):
+        classes_with_tag, files_with_tag = \
+            vt.find_tracked_modules(list(file_contents))
+
+    assert classes_with_tag == ['FirstClass', 'SecondClass', 'second_method']
+    assert files_with_tag == ['first/file.py', 'second/file.py',
+                              'second/file.py']
+
+
+def test__decorators_should_be_read_from_the_syntax_tree_of_valid_files():
+    example_file = '''"""
+@register_class_for_version_tracking
+class DocumentedClass:
+"""
+import hip_data_tools.hipages.version_tracking as vt
+
+
+class OuterClass:
+    @vt.register_method_for_version_tracking
+    def tracked_method(self):
+        return "@register_class_for_version_tracking"
+
+
+@register_class_for_version_tracking
+@some_other_decorator
+class TrackedClass:
+    pass
+'''
+
+    with patch("builtins.open", mock_open(read_data=example_file)):
+        classes_with_tag, files_with_tag = \
+            vt.find_tracked_modules(['some_file/location/this.file'])
+
+    assert classes_with_tag == ['TrackedClass', 'tracked_method']
+    assert files_with_tag == ['some_file/location/this.file',
+                              'some_file/location/this.file']
+
+
 def test__exception_raised_when_decorator_found_but_no_defintion(mocker):
     mappings = {
         'class': '@register_class_for_version_tracking',
@@ -127,60 +166,25 @@ def test__exception_raised_when_decorator_found_but_no_defintion(mocker):
                     list_of_files_to_analyse)
 
 
-def test__check_for_single_decorated_classes_in_file(mocker):
-    some_decorated_string = "@decorator_string"
-    type_definiton = "class"
-    example_file = """import foo
-    import pandas as pd
-    
-    {}
-    {} ClassToBeTracked
-        def __init__(self): 
-            self.foo = 1 
-    
-    {} ClassToBeIgnored    
-    """.format(some_decorated_string, type_definiton, type_definiton)
-    #
-    m = mock_open(read_data=example_file)
-    with patch('builtins.open', m, create=True):
-        classes_with_tag = \
-            vt.check_for_decorated_declaration_in_file('some/mocked/file/path',
-                                                       some_decorated_string,
-                                                       type_definiton)
+def test__check_for_single_decorated_classes_in_file(decorated_class_source, monkeypatch,
+                                                     decorator_string, type_definition):
+    monkeypatch.setattr('builtins.open', mock_open(read_data=decorated_class_source))
+    classes_with_tag = \
+        vt.check_for_decorated_declaration_in_file('some/mocked/file/path',
+                                                   decorator_string,
+                                                   type_definition)
 
     assert (len(classes_with_tag) == 1)
     assert classes_with_tag[0] == 'ClassToBeTracked'
 
 
-def test__check_for_all_decorated_classes_in_file(mocker):
-    some_decorated_string = "@decorator_string"
-    type_definiton = "class"
-    example_file = """import foo
-    import pandas as pd
-    
-    {}
-    {} ClassToBeTracked
-        def __init__(self): 
-            self.foo = 1 
-    
-    {} ClassToBeIgnored
-    
-    {}
-    {} AnotherClassToBeTracked
-        def __init__(self): 
-            self.foo = 1     
-    """.format(some_decorated_string,
-               type_definiton,
-               type_definiton,
-               some_decorated_string,
-               type_definiton)
-    #
-    m = mock_open(read_data=example_file)
-    with patch('builtins.open', m, create=True):
-        classes_with_tag = \
-            vt.check_for_decorated_declaration_in_file('some/mocked/file/path',
-                                                       some_decorated_string,
-                                                       type_definiton)
+def test__check_for_all_decorated_classes_in_file(multiple_decorated_classes_source, monkeypatch,
+                                                  decorator_string, type_definition):
+    monkeypatch.setattr('builtins.open', mock_open(read_data=multiple_decorated_classes_source))
+    classes_with_tag = \
+        vt.check_for_decorated_declaration_in_file('some/mocked/file/path',
+                                                   decorator_string,
+                                                   type_definition)
 
     assert (len(classes_with_tag) == 2)
     assert classes_with_tag[0] == 'ClassToBeTracked'
@@ -226,6 +230,95 @@ def test__get_latest_git_hash_of_files_in_repo(stub):
     assert ([commit_sha, commit_sha] == git_hashes)
 
 
+def _init_test_repo(path):
+    repo = git.Repo.init(path)
+    with repo.config_writer() as config:
+        config.set_value('user', 'name', 'tester')
+        config.set_value('user', 'email', 'tester@example.com')
+    return repo
+
+
+def test__get_latest_git_hash_of_files_in_repo_from_a_single_log(tmp_path):
+    repo = _init_test_repo(tmp_path)
+
+    first_file = tmp_path / 'first.py'
+    second_file = tmp_path / 'second.py'
+    first_file.write_text('a = 1')
+    second_file.write_text('b = 1')
+    repo.git.add('first.py', 'second.py')
+    repo.git.commit('-m', 'initial')
+    initial_commit = repo.git.rev_parse('HEAD')
+    second_file.write_text('b = 2')
+    repo.git.commit('-am', 'update second')
+    latest_commit = repo.git.rev_parse('HEAD')
+
+    git_hashes = vt.get_latest_git_hash_of_files_in_repo(
+        repo, [first_file, second_file, first_file])
+
+    assert git_hashes == [initial_commit, latest_commit, initial_commit]
+
+
+def test__get_latest_git_hash_of_files_in_repo_credits_merges(tmp_path):
+    repo = _init_test_repo(tmp_path)
+
+    tracked_file = tmp_path / 'tracked.py'
+    tracked_file.write_text('a = 1\n\n\n\n\nb = 1\n')
+    repo.git.add('tracked.py')
+    repo.git.commit('-m', 'initial')
+    main_branch = repo.git.rev_parse('--abbrev-ref', 'HEAD')
+
+    repo.git.checkout('-b', 'side')
+    tracked_file.write_text('a = 1\n\n\n\n\nb = 2\n')
+    repo.git.commit('-am', 'edit b on side')
+
+    repo.git.checkout(main_branch)
+    tracked_file.write_text('a = 2\n\n\n\n\nb = 1\n')
+    repo.git.commit('-am', 'edit a on main')
+    repo.git.merge('--no-ff', '-m', 'merge side', 'side')
+    merge_commit = repo.git.rev_parse('HEAD')
+
+    git_hashes = vt.get_latest_git_hash_of_files_in_repo(repo, [tracked_file])
+
+    assert tracked_file.read_text() == 'a = 2\n\n\n\n\nb = 2\n'
+    assert git_hashes == [merge_commit]
+
+
+def test__get_latest_git_hash_of_files_in_repo_follows_each_side_of_a_merge(
+        tmp_path):
+    repo = _init_test_repo(tmp_path)
+
+    first_file = tmp_path / 'a.py'
+    second_file = tmp_path / 'b.py'
+    first_file.write_text('a = 1')
+    second_file.write_text('b = 1')
+    repo.git.add('a.py', 'b.py')
+    repo.git.commit('-m', 'initial')
+    main_branch = repo.git.rev_parse('--abbrev-ref', 'HEAD')
+
+    repo.git.checkout('-b', 'side')
+    first_file.write_text('a = 3')
+    second_file.write_text('b = 3')
+    repo.git.commit('-am', 'edit both on side')
+    side_commit = repo.git.rev_parse('HEAD')
+
+    repo.git.checkout(main_branch)
+    first_file.write_text('a = 2')
+    second_file.write_text('b = 2')
+    repo.git.commit('-am', 'edit both on main')
+    main_commit = repo.git.rev_parse('HEAD')
+
+    # Keep a.py from main and b.py from side
+    repo.git.merge('-s', 'ours', '--no-commit', 'side')
+    repo.git.checkout('side', '--', 'b.py')
+    repo.git.commit('-m', 'merge side')
+
+    # Relative paths are relative to the root of the repo
+    git_hashes = vt.get_latest_git_hash_of_files_in_repo(repo,
+                                                         ['a.py', 'b.py'])
+
+    assert git_hashes == [main_commit, side_commit]
+
+
 def test__versiontracker_should_load_version_file():
     version_file = """{"some_class": "version_1"}"""
 
@@ -239,6 +332,18 @@ def test__versiontracker_should_load_version_file():
                {'some_class': 'version_1'}
 
 
+def test__versiontracker_should_load_version_file_without_orjson(mocker):
+    version_file = """{"some_class": "version_1"}"""
+    mocker.patch.object(vt, "orjson", None)
+
+    with patch("builtins.open", mock_open(read_data=version_file)):
+        version_tracker = vt.VersionTracker()
+
+        version_tracker.add_versions_from_json_file('some_location')
+
+        assert version_tracker._version_dict == {'some_class': 'version_1'}
+
+
 def test__versiontracker_should_raise_error_when_file_not_found():
     random_file_location = str(uuid.uuid4())
 
@@ -281,6 +386,53 @@ def test_versiontracker_should_add_a_consistent_object_version_for_tracking():
     assert expected_dict == version_tracker._version_dict
 
 
+def test_versiontracker_should_hash_an_object_only_once_per_call(mocker):
+    example_class = ExampleClass('attr1')
+    hash_spy = mocker.patch("joblib.hash", wraps=hash)
+
+    version_tracker = vt.VersionTracker()
+
+    version_tracker.add_object_versions({'example_class': example_class,
+                                         'same_example_class': example_class})
+
+    assert hash_spy.call_count == 1
+    assert version_tracker._version_dict == {
+        'example_class': '7755191057dcd7367e90110af2f38378',
+        'same_example_class': '7755191057dcd7367e90110af2f38378'}
+
+
+def test_versiontracker_should_rehash_an_object_that_changed():
+    example_class = ExampleClass('attr1')
+
+    version_tracker = vt.VersionTracker()
+
+    version_tracker.add_object_version('example_class', example_class)
+    example_class.some_attribute = 'attr2'
+    version_tracker.add_object_version('example_class', example_class)
+
+    assert version_tracker._version_dict == {
+        'example_class': '27a50c050e78a07ff1ccd27e4dcab7b7'}
+
+
+def test_versiontracker_should_use_the_provided_hash_function():
+    example_class = ExampleClass('attr1')
+
+    version_tracker = vt.VersionTracker(hash_fn=lambda obj: obj.some_attribute)
+    version_tracker.add_object_version('example_class', example_class)
+
+    assert version_tracker._version_dict == {'example_class': 'attr1'}
+
+
+def test__xxhash_fn_should_give_a_consistent_hash():
+    pytest.importorskip("xxhash")
+
+    first_hash = vt.xxhash_fn(ExampleClass('attr1'))
+
+    assert first_hash == vt.xxhash_fn(ExampleClass('attr1'))
+    assert first_hash != vt.xxhash_fn(ExampleClass('attr2'))
+    assert len(first_hash) == 32
+
+
 def test__versiontracker_should_add_string_to_version_tracking():
     version_tracker = vt.VersionTracker()
 
@@ -333,3 +485,37 @@ def test_versiontracker_provide_all_the_versions(mocker):
                              'versioning_timestamp': '2017-03-28T11:10:10'}
 
             assert expected_dict == version_dict
+
+
+def test_versiontracker_should_reuse_the_aggregated_version(mocker):
+    vtracker = vt.VersionTracker()
+    vtracker.add_string_to_version_tracking("A_path_to_something",
+                                            'some/path/some/where')
+
+    first_aggregated_version = \
+        vtracker.get_version_dict()['aggregated_version']
+    hash_spy = mocker.patch("joblib.hash", wraps=hash)
+    second_aggregated_version = \
+        vtracker.get_version_dict()['aggregated_version']
+
+    assert hash_spy.call_count == 0
+    assert first_aggregated_version == second_aggregated_version
+
+    vtracker.add_string_to_version_tracking("another_path_to_something",
+                                            'another/path/some/where')
+
+    assert vtracker.get_version_dict()['aggregated_version'] != \
+        first_aggregated_version
+
+
+def test_versiontracker_should_not_expose_its_version_dict():
+    vtracker = vt.VersionTracker()
+    vtracker.add_string_to_version_tracking("A_path_to_something",
+                                            'some/path/some/where')
+
+    version_dict = vtracker.get_version_dict()
+    version_dict["A_path_to_something"] = 'another/path/some/where'
+
+    assert vtracker.get_version_dict() != version_dict
+    assert vtracker._version_dict["A_path_to_something"] == \
+        'some/path/some/where'
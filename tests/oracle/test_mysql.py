@@ -1,6 +1,10 @@
 from datetime import datetime
 from unittest import TestCase
-from hip_data_tools.oracle.mysql import prepare_upsert_query
+from unittest.mock import patch
+
+from hip_data_tools.common import DictKeyValueSource
+from hip_data_tools.oracle.mysql import prepare_upsert_query, prepare_bulk_upsert_query, \
+    MySqlConnectionSettings, MySqlSecretsManager, MySqlConnectionManager, MySqlUtil
 
 
 class TestMySqlUtil(TestCase):
@@ -35,3 +39,57 @@ class TestMySqlUtil(TestCase):
     """
         self.assertEqual(actual_sql, expected_sql)
         self.assertEqual(actual_values, expected_values)
+
+    def test__bulk_upsert_query_should_work(self):
+        test_table = "TEST"
+        actual_sql, actual_values = prepare_bulk_upsert_query(
+            table=test_table,
+            primary_key_names=["pk1", "pk2"],
+            data_names=["col1", "col2"],
+            rows=[
+                {"pk1": 123, "pk2": "abc", "col1": "value1", "col2": 2345},
+                {"col2": 6789, "col1": "value2", "pk2": "def", "pk1": 456},
+            ]
+        )
+        expected_values = [(123, "abc", "value1", 2345), (456, "def", "value2", 6789)]
+        expected_sql = f"""
+    INSERT INTO {test_table} (pk1, pk2, col1, col2)
+    VALUES (%s,%s,%s,%s)
+    ON DUPLICATE KEY UPDATE col1=VALUES(col1), col2=VALUES(col2)
+    """
+        self.assertEqual(actual_sql, expected_sql)
+        self.assertEqual(actual_values, expected_values)
+
+    def test__upserts_should_reuse_a_pooled_connection(self):
+        with patch("hip_data_tools.oracle.mysql.MySQLdb.connect") as mock_connect:
+            util = MySqlUtil(conn=MySqlConnectionManager(_get_test_connection_settings()))
+            for index in range(1000):
+                util.upsert(table="TEST", primary_keys={"pk1": index}, data={"col1": "value"})
+
+        mock_connect.assert_called_once()
+        self.assertEqual(mock_connect.return_value.commit.call_count, 1000)
+
+    def test__pooled_connection_should_be_rolled_back_before_it_is_lent_again(self):
+        with patch("hip_data_tools.oracle.mysql.MySQLdb.connect") as mock_connect:
+            conn_mgr = MySqlConnectionManager(_get_test_connection_settings())
+            with conn_mgr.pooled_conn() as conn:
+                conn.cursor().execute("SELECT 1")
+                conn.rollback.assert_not_called()
+
+            conn.rollback.assert_called_once()
+            with conn_mgr.pooled_conn() as reused_conn:
+                self.assertIs(conn, reused_conn)
+                conn.rollback.assert_called_once()
+
+        mock_connect.assert_called_once()
+
+
+def _get_test_connection_settings():
+    return MySqlConnectionSettings(
+        host="localhost",
+        port=3306,
+        schema="test",
+        secrets_manager=MySqlSecretsManager(source=DictKeyValueSource({
+            "MYSQL_USERNAME": "user",
+            "MYSQL_PASSWORD": "pass",
+        })))
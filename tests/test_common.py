@@ -1,5 +1,6 @@
 import datetime
 import pandas as pd
+import pytest
 from unittest import TestCase
 from pandas._libs.tslibs.timestamps import Timestamp
 from pandas._testing import assert_frame_equal
@@ -7,129 +8,137 @@ from hip_data_tools.common import flatten_nested_dict, \
     to_snake_case, nested_list_of_dict_to_dataframe, validate_and_fix_common_integer_fields
 
 
-class TestCommon(TestCase):
-    def test__should__flatten_dict__with_one_level_of_nesting(self):
-        testinput = {
-            "abc": 123,
-            "def": "qwe",
-            "foo": {
-                "bar": "baz"
-            }
-        }
-        testexpected = {
-            "abc": 123,
-            "def": "qwe",
-            "foo_bar": "baz"
-        }
-        assert testexpected == flatten_nested_dict(testinput, "_")
-
-    def test__should__flatten_dict__with_two_levels_of_nesting(self):
-        testinput = {
-            "abc": 123,
-            "def": "qwe",
-            "foo": {
-                "bar": {
-                    "baz": "boo"
-                }
-            }
-        }
-        testexpected = {
-            "abc": 123,
-            "def": "qwe",
-            "foo_bar_baz": "boo"
-        }
-        assert testexpected == flatten_nested_dict(testinput)
+FLATTEN_DICT_CASES = (
+    (
+        "one_level_of_nesting",
+        {"abc": 123, "def": "qwe", "foo": {"bar": "baz"}},
+        {"abc": 123, "def": "qwe", "foo_bar": "baz"},
+    ),
+    (
+        "two_levels_of_nesting",
+        {"abc": 123, "def": "qwe", "foo": {"bar": {"baz": "boo"}}},
+        {"abc": 123, "def": "qwe", "foo_bar_baz": "boo"},
+    ),
+    (
+        "duplicate_keys",
+        {"abc": 123, "def": "qwe", "foo": {"bar": {"baz": "boo"}}, "foo_bar": {"baz": "boo2"}},
+        {"abc": 123, "def": "qwe", "foo_bar_baz": "boo2"},
+    ),
+    (
+        "duplicate_keys_flat_prefix_first",
+        {"foo_bar": {"baz": "boo2"}, "foo": {"bar": {"baz": "boo"}}},
+        {"foo_bar_baz": "boo"},
+    ),
+    (
+        "camel_case",
+        {"abc": 123, "def": "qwe", "foo": {"bar": {"baz": "boo"}}, "fooBar": {"Baz": "boo2"}},
+        {"abc": 123, "def": "qwe", "foo_bar_baz": "boo2"},
+    ),
+)
 
-    def test__should__flatten_dict__with_duplicate_keys(self):
-        # sourcery skip: class-extract-method
-        testinput = {"abc": 123, "def": "qwe", "foo": {"bar": {"baz": "boo"}}, "foo_bar": {"baz": "boo2"}}
-        testexpected = {"abc": 123, "def": "qwe", "foo_bar_baz": "boo2"}
-        self.assertDictEqual(flatten_nested_dict(testinput), testexpected)
+SNAKE_CASE_CASES = (
+    ("camel_case", "ThisIsCamelCase", "this_is_camel_case"),
+    ("spaces", "ThisIs Camel Case", "this_is__camel__case"),
+    ("special_chars", "This%Is.Camel$%#@!^Case", "this__is__camel_______case"),
+    ("id", "ThisIsAnID", "this_is_an_i_d"),
+)
 
 
-    def test__should__flatten_dict__with_camel_case(self):
-        testinput = {"abc": 123, "def": "qwe", "foo": {"bar": {"baz": "boo"}}, "fooBar": {"Baz": "boo2"}}
-        testexpected = {"abc": 123, "def": "qwe", "foo_bar_baz": "boo2"}
-        self.assertDictEqual(flatten_nested_dict(testinput), testexpected)
+class ComplexFieldObject:
+    def __init__(self):
+        self.x = 'hello'
+        self.y = 'world'
 
-    def test__should__convert_to_snake_case__with_camel_case(self):
-        # sourcery skip: class-extract-method
-        testinput = "ThisIsCamelCase"
-        testexpected = "this_is_camel_case"
-        self.assertEqual(testexpected, to_snake_case(testinput))
 
-    def test__should__convert_to_snake_case__with_spaces(self):
-        testinput = "ThisIs Camel Case"
-        testexpected = "this_is__camel__case"
-        self.assertEqual(testexpected, to_snake_case(testinput))
+NESTED_ITEM_RECORDS = (
+    {
+        "abc": 123,
+        "def": "qwe",
+        "fooBar": {
+            "Baz": "boo2"
+        }
+    },
+    {
+        "abc": 345,
+        "def": "wer",
+        "fooBar": {
+            "Baz": "bgt"
+        }
+    },
+)
 
-    def test__should__convert_to_snake_case__with_special_chars(self):
-        testinput = "This%Is.Camel$%#@!^Case"
-        testexpected = "this__is__camel_______case"
-        self.assertEqual(testexpected, to_snake_case(testinput))
+COMPLEX_LIST_RECORDS = (
+    {
+        'adGroupId': 94823864785,
+        'labels': 'Hello_1',
+        'tuple_field': ("field_1", "val_1"),
+        'bool_field': True,
+        'array_field': [["v1", "v2"]],
+        'num_array_filed': [1, 3, 4, 5],
+        'time_field': datetime.datetime(2020, 6, 18),
+        'complex_field': []
+    },
+    {
+        'adGroupId': 34523864785,
+        'labels': 'Hello_2',
+        'tuple_field': ("field_2", "val_2"),
+        'bool_field': False,
+        'array_field': [[["v1", "v2"], []]],
+        'num_array_filed': [1, 3, 4, 5],
+        'time_field': datetime.datetime(2020, 6, 18),
+        'complex_field': [ComplexFieldObject()]
+    }
+)
 
-    def test__should__convert_to_snake_case__with_id(self):
-        testinput = "ThisIsAnID"
-        testexpected = "this_is_an_i_d"
-        self.assertEqual(testexpected, to_snake_case(testinput))
 
-    def test__should__convert_list_of_dict_to_proper_df__with__nested_items(self):
-        testinput = [
-            {
-                "abc": 123,
-                "def": "qwe",
-                "fooBar": {
-                    "Baz": "boo2"
-                }
-            },
-            {
-                "abc": 345,
-                "def": "wer",
-                "fooBar": {
-                    "Baz": "bgt"
-                }
-            },
-        ]
-        testexpected = ['abc', 'def', 'foo_bar_baz']
-        actual = nested_list_of_dict_to_dataframe(testinput)
-        assert testexpected == list(actual.columns.values)
+@pytest.mark.parametrize("testinput,testexpected",
+                         [case[1:] for case in FLATTEN_DICT_CASES],
+                         ids=[case[0] for case in FLATTEN_DICT_CASES])
+def test__should__flatten_dict(testinput, testexpected):
+    assert testexpected == flatten_nested_dict(testinput, "_")
 
-    def test__should__return_dataframe__when__a_list_of_dictionaries_with_complex_lists_is_given(self):
-        testinput = [
+
+@pytest.mark.parametrize("testinput,testexpected",
+                         [case[1:] for case in SNAKE_CASE_CASES],
+                         ids=[case[0] for case in SNAKE_CASE_CASES])
+def test__should__convert_to_snake_case(testinput, testexpected):
+    assert testexpected == to_snake_case(testinput)
+
+
+class TestCommon(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._expected_complex_df = pd.DataFrame.from_records([
             {
-                'adGroupId': 94823864785,
+                'ad_group_id': 94823864785,
                 'labels': 'Hello_1',
-                'tuple_field': ("field_1", "val_1"),
+                'tuple_field': ('field_1', 'val_1'),
                 'bool_field': True,
-                'array_field': [["v1", "v2"]],
-                'num_array_filed': [1, 3, 4, 5],
-                'time_field': datetime.datetime(2020, 6, 18),
+                'array_field': ['["v1", "v2"]'],
+                'num_array_filed': ['1', '3', '4', '5'],
+                'time_field': Timestamp('2020-06-18 00:00:00'),
                 'complex_field': []
             },
             {
-                'adGroupId': 34523864785,
+                'ad_group_id': 34523864785,
                 'labels': 'Hello_2',
-                'tuple_field': ("field_2", "val_2"),
+                'tuple_field': ('field_2', 'val_2'),
                 'bool_field': False,
-                'array_field': [[["v1", "v2"], []]],
-                'num_array_filed': [1, 3, 4, 5],
-                'time_field': datetime.datetime(2020, 6, 18),
-                'complex_field': [TestObject()]
-            }
-        ]
-        testinput = nested_list_of_dict_to_dataframe(testinput)
-        data = {'ad_group_id': {0: 94823864785, 1: 34523864785},
-                'labels': {0: 'Hello_1', 1: 'Hello_2'},
-                'tuple_field': {0: ('field_1', 'val_1'), 1: ('field_2', 'val_2')},
-                'bool_field': {0: True, 1: False},
-                'array_field': {0: ['["v1", "v2"]'], 1: ['[["v1", "v2"], []]']},
-                'num_array_filed': {0: ['1', '3', '4', '5'], 1: ['1', '3', '4', '5']},
-                'time_field': {
-                    0: Timestamp('2020-06-18 00:00:00'),
-                    1: Timestamp('2020-06-18 00:00:00')
-                },
-                'complex_field': {0: [], 1: ['{"x": "hello", "y": "world"}']}}
-        assert_frame_equal(pd.DataFrame(data=data), testinput)
+                'array_field': ['[["v1", "v2"], []]'],
+                'num_array_filed': ['1', '3', '4', '5'],
+                'time_field': Timestamp('2020-06-18 00:00:00'),
+                'complex_field': ['{"x": "hello", "y": "world"}']
+            },
+        ])
+
+    def test__should__convert_list_of_dict_to_proper_df__with__nested_items(self):
+        testexpected = ['abc', 'def', 'foo_bar_baz']
+        actual = nested_list_of_dict_to_dataframe(NESTED_ITEM_RECORDS)
+        self.assertEqual(testexpected, list(actual.columns.values))
+
+    def test__should__return_dataframe__when__a_list_of_dictionaries_with_complex_lists_is_given(self):
+        testinput = nested_list_of_dict_to_dataframe(COMPLEX_LIST_RECORDS)
+        assert_frame_equal(self._expected_complex_df, testinput, check_exact=True)
 
     def test__should__validate_and_fix_common_integer_fields(self):
         testinput = pd.DataFrame(data={
@@ -143,7 +152,24 @@ class TestCommon(TestCase):
         })
         assert_frame_equal(testexpected, testinput)
 
-class TestObject:
-    def __init__(self):
-        self.x = 'hello'
-        self.y = 'world'
+    def test__should__validate_and_fix_common_integer_fields_as_int64(self):
+        testinput = pd.DataFrame(data={
+            "id": ["12", None, "abc"],
+            "campaign_id": [1.0, float("nan"), 3.0],
+        })
+        validate_and_fix_common_integer_fields(testinput)
+        self.assertEqual(["int64", "int64"], [str(dtype) for dtype in testinput.dtypes])
+        self.assertEqual([12, 0, 0], testinput["id"].tolist())
+        self.assertEqual([1, 0, 3], testinput["campaign_id"].tolist())
+
+    def test__should__validate_and_fix_common_integer_fields__with_arrow_strings(self):
+        testinput = pd.DataFrame(data={
+            "id": pd.array([None, "34523864785"], dtype="string[pyarrow]"),
+            "country__territory": pd.array(["----", "3434"], dtype="string[pyarrow]")
+        })
+        validate_and_fix_common_integer_fields(testinput)
+        testexpected = pd.DataFrame(data={
+            "id": [0, 34523864785],
+            "country__territory": [0, 3434]
+        })
+        assert_frame_equal(testexpected, testinput)